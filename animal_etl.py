@@ -3,23 +3,49 @@ ETL System for Animal Data Processing
 Fetches, transforms, and loads animal data from API
 """
 
+import argparse
+import atexit
+import gzip
 import logging
+import os
+import sys
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
 
-import pytz
+import orjson
 import requests
-from requests.exceptions import HTTPError, RequestException
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+from diskcache import Cache
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:3123"
 BATCH_SIZE = 100
+MAX_WORKERS = 64
+POST_WORKERS = 4
+PAGE_WORKERS = 8
+DETAIL_WINDOW = MAX_WORKERS * 2
+DETAIL_CACHE_TTL = 86400
+MAX_ERRORS = 1000
+GZIP_REQUESTS = os.environ.get("ETL_GZIP") == "1"
+DONE_PATH = Path(".etl_cache/done.txt")
+
+_UTC = timezone.utc
+_MS_CUTOFF = 10_000_000_000
+_ISO_ACCEPTS_Z = sys.version_info >= (3, 11)
+_KEEP_KEYS = ("id", "name", "species", "age", "friends", "born_at")
+_POST_URL = f"{BASE_URL}/animals/v1/home"
+_POST_HEADERS = {"Content-Encoding": "gzip"} if GZIP_REQUESTS else None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,175 +54,234 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SESSION = requests.Session()
+# total=5 allows up to 6 attempts per request
+retry = Retry(
+    total=5,
+    backoff_factor=1,
+    backoff_max=10,
+    backoff_jitter=1,
+    status_forcelist={500, 502, 503, 504},
+    allowed_methods={"GET"},
+    raise_on_status=False,
+)
+adapter = HTTPAdapter(
+    pool_connections=32, pool_maxsize=MAX_WORKERS + POST_WORKERS, max_retries=retry
+)
+SESSION.mount("http://", adapter)
+SESSION.mount("https://", adapter)
+# POSTs are not idempotent: retry refused connections and 5xx responses,
+# but never resend a batch whose response was lost after it was sent
+post_adapter = HTTPAdapter(
+    pool_maxsize=POST_WORKERS,
+    max_retries=retry.new(read=0, allowed_methods={"POST"}),
+)
+SESSION.mount(_POST_URL, post_adapter)
+SESSION.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+SESSION.headers.update(make_headers(accept_encoding=True))
+atexit.register(SESSION.close)
+
+DETAIL_CACHE = Cache("./.etl_cache/details")
+atexit.register(DETAIL_CACHE.close)
+
 
 class ETLStats:
     """Track ETL process statistics"""
 
+    __slots__ = (
+        "start_time",
+        "animals_found",
+        "animals_skipped",
+        "animals_processed",
+        "animals_posted",
+        "batches_posted",
+        "errors",
+        "error_count",
+        "lock",
+    )
+
     def __init__(self):
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.animals_found = 0
+        self.animals_skipped = 0
         self.animals_processed = 0
         self.animals_posted = 0
         self.batches_posted = 0
-        self.errors = []
+        self.errors = deque(maxlen=MAX_ERRORS)
+        self.error_count = 0
+        self.lock = threading.Lock()
 
     def duration(self) -> float:
-        return time.time() - self.start_time
+        return time.monotonic() - self.start_time
 
     def add_error(self, error: str):
         self.errors.append(error)
+        self.error_count += 1
         logger.error(error)
 
 
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=1, max=8),
-    retry=retry_if_exception_type((RequestException, HTTPError)),
-)
 def fetch_animals_page(page: int) -> Dict[str, Any]:
-    """Fetch a single page of animals with retry logic"""
+    """Fetch a single page of animals (retries are handled by the session adapter)"""
     try:
-        response = requests.get(
+        response = SESSION.get(
             f"{BASE_URL}/animals/v1/animals", params={"page": page}, timeout=30
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except requests.exceptions.Timeout:
-        logger.warning(f"Timeout on page {page}, retrying...")
+        logger.warning(f"Timeout on page {page}")
         raise
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code >= 500:
-            logger.warning(f"Server error on page {page}, retrying...")
-            raise
-        else:
-            logger.error(f"HTTP error on page {page}: {e}")
-            raise
+        logger.error(f"HTTP error on page {page}: {e}")
+        raise
 
 
-def fetch_all_animal_ids() -> List[int]:
-    """Fetch all animal IDs from paginated API"""
-    logger.info("Starting to fetch all animal IDs...")
-    animal_ids = []
-    page = 1
+def fetch_animal_pages() -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (page, data) for every page of the animal list. Once page 1
+    reports total_pages, the remaining pages are fetched concurrently.
+    """
+    data = fetch_animals_page(1)
+    yield 1, data
 
-    while True:
-        try:
-            data = fetch_animals_page(page)
+    if not data.get("items"):
+        return
 
+    total_pages = data.get("total_pages")
+    if total_pages:
+        pages = range(2, total_pages + 1)
+        with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+            yield from zip(pages, executor.map(fetch_animals_page, pages))
+    else:
+        page = 2
+        while True:
+            data = fetch_animals_page(page)
             if not data.get("items"):
-                break
+                return
+            yield page, data
+            page += 1
+
+
+def iter_animal_ids() -> Iterator[List[int]]:
+    """Yield the not yet seen animal IDs of each page as soon as it arrives"""
+    logger.info("Starting to fetch all animal IDs...")
+    seen: Set[int] = set()
 
-            page_ids = [item["id"] for item in data["items"] if "id" in item]
-            animal_ids.extend(page_ids)
+    try:
+        for page, data in fetch_animal_pages():
+            page_ids = [item["id"] for item in data.get("items") or [] if "id" in item]
+            new_ids = [i for i in dict.fromkeys(page_ids) if i not in seen]
+            seen.update(new_ids)
 
             total_pages = data.get("total_pages", "?")
             logger.info(f"Page {page}/{total_pages}: Found {len(page_ids)} animals")
+            yield new_ids
 
-            if data.get("total_pages") and page >= data["total_pages"]:
-                break
+    except Exception as e:
+        logger.error(f"Failed to fetch animal pages: {e}")
+        raise
 
-            page += 1
+    logger.info(f"Total unique animals found: {len(seen)}")
 
-        except Exception as e:
-            logger.error(f"Failed to fetch page {page}: {e}")
-            raise
 
-    unique_ids = list(set(animal_ids))
-    logger.info(f"Total unique animals found: {len(unique_ids)}")
-    return unique_ids
+def fetch_all_animal_ids() -> List[int]:
+    """Fetch all animal IDs from paginated API"""
+    return [animal_id for page_ids in iter_animal_ids() for animal_id in page_ids]
 
 
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=1, max=8),
-    retry=retry_if_exception_type((RequestException, HTTPError)),
-)
 def fetch_animal_details(animal_id: int) -> Dict[str, Any]:
-    """Fetch detailed information for a specific animal"""
+    """Fetch detailed information for a specific animal, keeping only posted fields"""
     try:
-        response = requests.get(
-            f"{BASE_URL}/animals/v1/animals/{animal_id}", timeout=30
-        )
+        response = SESSION.get(f"{BASE_URL}/animals/v1/animals/{animal_id}", timeout=30)
         response.raise_for_status()
-        return response.json()
+        details = orjson.loads(response.content)
+        return {key: details[key] for key in _KEEP_KEYS if key in details}
     except requests.exceptions.Timeout:
-        logger.warning(f"Timeout fetching animal {animal_id}, retrying...")
+        logger.warning(f"Timeout fetching animal {animal_id}")
         raise
     except requests.exceptions.HTTPError as e:
-        if e.response.status_code >= 500:
-            logger.warning(f"Server error fetching animal {animal_id}, retrying...")
-            raise
-        else:
-            logger.error(f"HTTP error fetching animal {animal_id}: {e}")
-            raise
+        logger.error(f"HTTP error fetching animal {animal_id}: {e}")
+        raise
+
 
+def fetch_animal_details_cached(animal_id: int) -> Dict[str, Any]:
+    """Fetch animal details, serving previously seen IDs from the disk cache"""
+    details = DETAIL_CACHE.get(animal_id)
+    if details is None:
+        details = fetch_animal_details(animal_id)
+        DETAIL_CACHE.set(animal_id, details, expire=DETAIL_CACHE_TTL)
+    return details
 
-def transform_animal(animal: Dict[str, Any]) -> Dict[str, Any]:
+
+def transform_animals_batch(animals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Transform animal data:
+    Transform a batch of animals in place:
     1. Convert friends from comma-delimited string to array
-    2. Convert born_at to ISO8601 UTC timestamp
+    2. Convert born_at to a UTC datetime (serialized as ISO8601 by orjson)
     """
-    transformed = animal.copy()
-
-    if "friends" in transformed and transformed["friends"]:
-        if isinstance(transformed["friends"], str):
-            friends_list = [
-                f.strip() for f in transformed["friends"].split(",") if f.strip()
-            ]
-            transformed["friends"] = friends_list
-    else:
-        transformed["friends"] = []
+    for animal in animals:
+        friends = animal.get("friends")
+        if not friends:
+            animal["friends"] = []
+        elif isinstance(friends, str):
+            animal["friends"] = [f.strip() for f in friends.split(",") if f.strip()]
+
+        born_at = animal.get("born_at")
+        if not born_at:
+            continue
 
-    if "born_at" in transformed and transformed["born_at"]:
         try:
-            if isinstance(transformed["born_at"], (int, float)):
-                timestamp = transformed["born_at"]
-                if timestamp > 1e10:
-                    timestamp = timestamp / 1000
-                dt = datetime.fromtimestamp(timestamp, tz=pytz.UTC)
-            elif isinstance(transformed["born_at"], str):
-                dt = datetime.fromisoformat(
-                    transformed["born_at"].replace("Z", "+00:00")
-                )
+            if isinstance(born_at, (int, float)):
+                if born_at > _MS_CUTOFF:
+                    born_at = born_at / 1000
+                dt = datetime.fromtimestamp(born_at, _UTC)
+            elif (
+                isinstance(born_at, str)
+                and born_at.endswith("Z")
+                and "+" not in born_at
+                and born_at.count("-") <= 2
+            ):
+                # Already UTC: parse without the offset, skip the conversion
+                dt = datetime.fromisoformat(born_at[:-1]).replace(tzinfo=_UTC)
+            elif isinstance(born_at, str):
+                if _ISO_ACCEPTS_Z:
+                    dt = datetime.fromisoformat(born_at)
+                else:
+                    dt = datetime.fromisoformat(born_at.replace("Z", "+00:00"))
                 if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=pytz.UTC)
+                    dt = dt.replace(tzinfo=_UTC)
                 else:
-                    dt = dt.astimezone(pytz.UTC)
+                    dt = dt.astimezone(_UTC)
+            else:
+                raise TypeError(f"unexpected type {type(born_at).__name__}")
 
-            transformed["born_at"] = dt.isoformat()
+            animal["born_at"] = dt
 
         except Exception as e:
             logger.warning(
                 f"Failed to transform born_at for animal {animal.get('id', 'unknown')}: {e}"
             )
 
-    return transformed
+    return animals
 
 
-@retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((RequestException, HTTPError)),
-)
 def post_animals_batch(batch: List[Dict[str, Any]]) -> None:
     """POST a batch of animals to the home endpoint"""
     if len(batch) > 100:
         raise ValueError(f"Batch size {len(batch)} exceeds maximum of 100")
 
+    body = orjson.dumps(batch)
+    if GZIP_REQUESTS:
+        body = gzip.compress(body, compresslevel=1)
+
     try:
         logger.info(f"Posting batch of {len(batch)} animals...")
-        response = requests.post(
-            f"{BASE_URL}/animals/v1/home",
-            json=batch,
-            timeout=60,
-            headers={"Content-Type": "application/json"},
-        )
+        response = SESSION.post(_POST_URL, data=body, headers=_POST_HEADERS, timeout=60)
         response.raise_for_status()
         logger.info(f"Successfully posted batch of {len(batch)} animals")
 
     except requests.exceptions.Timeout:
-        logger.warning("Timeout posting batch, retrying...")
+        logger.warning("Timeout posting batch")
         raise
     except requests.exceptions.HTTPError as e:
         logger.error(f"HTTP error posting batch: {e}")
@@ -205,42 +290,127 @@ def post_animals_batch(batch: List[Dict[str, Any]]) -> None:
         raise
 
 
-def run_etl_process() -> ETLStats:
+def load_done_ids() -> Set[int]:
+    """Read the IDs checkpointed as posted by previous runs"""
+    if not DONE_PATH.exists():
+        return set()
+    with DONE_PATH.open() as f:
+        return {int(line) for line in f if line.strip()}
+
+
+def checkpoint_done_ids(batch: List[Dict[str, Any]]) -> None:
+    """Durably append the IDs of a successfully posted batch"""
+    DONE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with DONE_PATH.open("a") as f:
+        f.write("".join(f"{animal['id']}\n" for animal in batch))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def reap_posted(
+    done: Set[Future], pending: Dict[Future, List], stats: ETLStats
+) -> None:
+    """Record finished POSTs and checkpoint their IDs (on the calling thread)"""
+    for future in done:
+        batch = pending.pop(future)
+        error = future.exception()
+        if error is not None:
+            with stats.lock:
+                stats.add_error(f"Failed to post batch: {error}")
+            continue
+
+        with stats.lock:
+            stats.animals_posted += len(batch)
+            stats.batches_posted += 1
+        try:
+            checkpoint_done_ids(batch)
+        except OSError as e:
+            with stats.lock:
+                stats.add_error(f"Failed to checkpoint posted batch: {e}")
+
+
+def submit_batch(
+    executor: ThreadPoolExecutor,
+    pending: Dict[Future, List],
+    batch: List[Dict[str, Any]],
+    stats: ETLStats,
+) -> None:
+    """Queue a batch for posting, waiting while POST_WORKERS batches are in flight"""
+    while len(pending) >= POST_WORKERS:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        reap_posted(done, pending, stats)
+
+    pending[executor.submit(post_animals_batch, batch)] = batch
+
+
+def run_etl_process(use_cache: bool = True, resume: bool = True) -> ETLStats:
     """Run the complete ETL process"""
     stats = ETLStats()
+    fetch_details = fetch_animal_details_cached if use_cache else fetch_animal_details
+    done_ids = load_done_ids() if resume else set()
     logger.info("Starting ETL process...")
+    if done_ids:
+        logger.info(f"Resuming: skipping {len(done_ids)} already posted animals")
 
-    try:
-        animal_ids = fetch_all_animal_ids()
-        stats.animals_found = len(animal_ids)
-
-        if not animal_ids:
-            logger.warning("No animals found to process")
-            return stats
+    post_executor = ThreadPoolExecutor(max_workers=POST_WORKERS)
+    pending_posts: Dict[Future, List] = {}
+    batch = []
 
-        batch = []
-
-        for i, animal_id in enumerate(animal_ids, 1):
-            try:
-                animal_details = fetch_animal_details(animal_id)
+    def handle_result(future: Future, animal_id: int) -> None:
+        nonlocal batch
+        try:
+            batch.append(future.result())
+            stats.animals_processed += 1
 
-                transformed_animal = transform_animal(animal_details)
-                batch.append(transformed_animal)
-                stats.animals_processed += 1
+            if len(batch) >= BATCH_SIZE:
+                transform_animals_batch(batch)
+                submit_batch(post_executor, pending_posts, batch, stats)
+                batch = []
 
-                if len(batch) >= BATCH_SIZE or i == len(animal_ids):
-                    post_animals_batch(batch)
-                    stats.animals_posted += len(batch)
-                    stats.batches_posted += 1
-                    batch = []
+            if stats.animals_processed % 100 == 0:
+                logger.info(
+                    f"Processed {stats.animals_processed}/{stats.animals_found} animals..."
+                )
 
-                if i % 100 == 0:
-                    logger.info(f"Processed {i}/{len(animal_ids)} animals...")
+        except Exception as e:
+            with stats.lock:
+                stats.add_error(f"Failed to process animal {animal_id}: {e}")
 
-            except Exception as e:
-                error_msg = f"Failed to process animal {animal_id}: {e}"
-                stats.add_error(error_msg)
-                continue
+    try:
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                futures: Dict[Future, int] = {}
+
+                def handle_completed() -> None:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        handle_result(future, futures.pop(future))
+
+                # Detail fetches start as soon as each page of IDs arrives,
+                # with at most DETAIL_WINDOW of them queued or running.
+                for page_ids in iter_animal_ids():
+                    stats.animals_found += len(page_ids)
+                    for animal_id in page_ids:
+                        if animal_id in done_ids:
+                            stats.animals_skipped += 1
+                            continue
+                        if len(futures) >= DETAIL_WINDOW:
+                            handle_completed()
+                        futures[executor.submit(fetch_details, animal_id)] = animal_id
+
+                if not stats.animals_found:
+                    logger.warning("No animals found to process")
+                    return stats
+
+                while futures:
+                    handle_completed()
+
+                if batch:
+                    transform_animals_batch(batch)
+                    submit_batch(post_executor, pending_posts, batch, stats)
+        finally:
+            post_executor.shutdown(wait=True)
+            reap_posted(set(pending_posts), pending_posts, stats)
 
         logger.info(f"ETL process completed in {stats.duration():.2f} seconds")
         logger.info(
@@ -251,7 +421,10 @@ def run_etl_process() -> ETLStats:
         )
 
         if stats.errors:
-            logger.warning(f"Encountered {len(stats.errors)} errors during processing")
+            logger.warning(f"Encountered {stats.error_count} errors during processing")
+        else:
+            # Everything was posted, so the next run starts from scratch
+            DONE_PATH.unlink(missing_ok=True)
 
     except Exception as e:
         error_msg = f"ETL process failed: {e}"
@@ -261,30 +434,49 @@ def run_etl_process() -> ETLStats:
     return stats
 
 
-def main():
-    """Main entry point"""
+def main() -> int:
+    """Main entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description="Animal ETL Process")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch every animal from the API, ignoring the on-disk detail cache",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Process every animal, including those posted by a previous run",
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Wait for a key press before exiting (for interactive terminals)",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Animal ETL Process")
     print("=" * 60)
 
-    stats = run_etl_process()
+    stats = run_etl_process(use_cache=not args.no_cache, resume=not args.no_resume)
 
     print("\n" + "=" * 60)
     print("ETL PROCESS SUMMARY")
     print("=" * 60)
     print(f"Duration: {stats.duration():.2f} seconds")
     print(f"Animals Found: {stats.animals_found}")
+    print(f"Animals Skipped (already posted): {stats.animals_skipped}")
     print(f"Animals Processed: {stats.animals_processed}")
     print(f"Animals Posted: {stats.animals_posted}")
     print(f"Batches Posted: {stats.batches_posted}")
 
     if stats.errors:
-        print(f"\nErrors ({len(stats.errors)}):")
-        for error in stats.errors[-5:]:
+        print(f"\nErrors ({stats.error_count}):")
+        for error in list(stats.errors)[-5:]:
             print(f"  - {error}")
 
     success_rate = (
-        (stats.animals_processed / stats.animals_found * 100)
+        ((stats.animals_processed + stats.animals_skipped) / stats.animals_found * 100)
         if stats.animals_found > 0
         else 0
     )
@@ -295,8 +487,11 @@ def main():
     else:
         print("⚠️  ETL process completed with issues")
 
-    input("\nPress any key to exit...")
+    if args.wait:
+        input("\nPress any key to exit...")
+
+    return 1 if stats.error_count else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
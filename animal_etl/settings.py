@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -122,3 +123,18 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Redis instance used to share fetched animal details between ETL runs.
+# Leave unset to always fetch details from the API.
+ETL_REDIS_URL = os.environ.get("ETL_REDIS_URL")
+
+# Celery runs ETL jobs started from the web UI on a dedicated worker.
+# Start one with: celery -A animal_etl worker --concurrency=1
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_TASK_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_TASK_ACKS_LATE = True
+# Redis redelivers unacknowledged tasks after visibility_timeout (default 1h);
+# keep it above the longest ETL run so a job is never started twice.
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 12 * 60 * 60}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
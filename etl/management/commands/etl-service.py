@@ -2,7 +2,7 @@ import logging
 
 from django.core.management.base import BaseCommand
 
-from etl.utils.etl_service import run_etl_process
+from etl.utils.etl_service import DETAIL_WORKERS, MAX_CONCURRENCY, run_etl_process
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +21,25 @@ class Command(BaseCommand):
             default=100,
             help="Number of animals to process in each batch (default: 100)",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DETAIL_WORKERS,
+            help=(
+                "Number of animal detail requests in flight "
+                f"(default: {DETAIL_WORKERS}, max: {MAX_CONCURRENCY})"
+            ),
+        )
+        parser.add_argument(
+            "--force-refresh",
+            action="store_true",
+            help="Also process animals that were already sent to home",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Fetch every animal from the API, ignoring cached details",
+        )
         parser.add_argument(
             "--verbose", action="store_true", help="Enable verbose logging"
         )
@@ -35,7 +54,12 @@ class Command(BaseCommand):
             self.style.SUCCESS(f"Starting ETL process with batch size: {batch_size}")
         )
 
-        stats = run_etl_process(batch_size=batch_size)
+        stats = run_etl_process(
+            batch_size=batch_size,
+            concurrency=options["concurrency"],
+            force_refresh=options["force_refresh"],
+            use_cache=not options["no_cache"],
+        )
 
         self.display_results(stats)
 
@@ -48,16 +72,17 @@ class Command(BaseCommand):
         self.stdout.write(f"Status: {stats.current_step}")
         self.stdout.write(f"Duration: {stats.get_duration():.2f} seconds")
         self.stdout.write(f"Animals Found: {stats.total_animals_found}")
+        self.stdout.write(f"Animals Skipped: {stats.animals_skipped}")
         self.stdout.write(f"Animals Processed: {stats.animals_processed}")
         self.stdout.write(f"Animals Posted: {stats.animals_posted}")
         self.stdout.write(f"Batches Posted: {stats.batches_posted}")
 
         if stats.errors:
-            self.stdout.write(f"\nErrors ({len(stats.errors)}):")
-            for error in stats.errors[-10:]:  # Show last 10 errors
+            self.stdout.write(f"\nErrors ({stats.error_count}):")
+            for error in list(stats.errors)[-10:]:  # Show last 10 errors
                 self.stdout.write(self.style.ERROR(f"  - {error}"))
-            if len(stats.errors) > 10:
-                self.stdout.write(f"  ... and {len(stats.errors) - 10} more errors")
+            if stats.error_count > 10:
+                self.stdout.write(f"  ... and {stats.error_count - 10} more errors")
 
         if stats.current_step == "Completed":
             self.stdout.write(
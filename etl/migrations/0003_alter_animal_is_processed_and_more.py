@@ -0,0 +1,47 @@
+# Generated by Django 5.2.2 on 2026-10-15 21:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("etl", "0002_etlprocessinglog_batches_posted"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="animal",
+            name="is_processed",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name="animal",
+            name="is_sent_to_home",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterField(
+            model_name="apierrorlog",
+            name="resolved",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddIndex(
+            model_name="animal",
+            index=models.Index(
+                fields=["-processed_at"], name="animals_process_8ef118_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="animal",
+            index=models.Index(
+                fields=["species", "is_processed"], name="animals_species_1071ab_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="apierrorlog",
+            index=models.Index(
+                fields=["-occurred_at", "resolved"],
+                name="api_error_l_occurre_42c74d_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-15 22:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("etl", "0003_alter_animal_is_processed_and_more"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="animal",
+            name="animals_process_8ef118_idx",
+        ),
+        migrations.AddIndex(
+            model_name="animal",
+            index=models.Index(
+                fields=["-processed_at", "-id"], name="animals_process_bd23bc_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-15 22:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("etl", "0004_animal_processed_at_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="etlprocessinglog",
+            name="animals_skipped",
+            field=models.IntegerField(default=0),
+        ),
+    ]
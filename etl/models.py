@@ -22,12 +22,16 @@ class Animal(models.Model):
     )
 
     processed_at = models.DateTimeField(auto_now_add=True)
-    is_processed = models.BooleanField(default=False)
-    is_sent_to_home = models.BooleanField(default=False)
+    is_processed = models.BooleanField(default=False, db_index=True)
+    is_sent_to_home = models.BooleanField(default=False, db_index=True)
 
     class Meta:
         db_table = "animals"
         ordering = ["api_id"]
+        indexes = [
+            models.Index(fields=["-processed_at", "-id"]),
+            models.Index(fields=["species", "is_processed"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.species}) - ID: {self.api_id}"
@@ -56,6 +60,7 @@ class ETLProcessingLog(models.Model):
     total_animals_fetched = models.IntegerField(default=0)
     total_animals_processed = models.IntegerField(default=0)
     total_animals_sent = models.IntegerField(default=0)
+    animals_skipped = models.IntegerField(default=0)
     batches_posted = models.IntegerField(null=True, blank=True, default=0)
     errors_encountered = models.TextField(blank=True)
     status = models.CharField(
@@ -88,11 +93,12 @@ class APIErrorLog(models.Model):
     http_status_code = models.IntegerField(null=True, blank=True)
     retry_attempt = models.IntegerField(default=0)
     occurred_at = models.DateTimeField(auto_now_add=True)
-    resolved = models.BooleanField(default=False)
+    resolved = models.BooleanField(default=False, db_index=True)
 
     class Meta:
         db_table = "api_error_logs"
         ordering = ["-occurred_at"]
+        indexes = [models.Index(fields=["-occurred_at", "resolved"])]
 
     def __str__(self):
         return f"API Error: {self.endpoint} - {self.error_type} (Attempt {self.retry_attempt})"
@@ -0,0 +1,31 @@
+import logging
+
+import orjson
+from celery import shared_task
+from django.utils import timezone
+
+from .models import ETLProcessingLog
+from .utils.etl_service import DETAIL_WORKERS, run_etl_process
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_etl_background(
+    job_id, batch_size=100, concurrency=DETAIL_WORKERS, force_refresh=False
+):
+    """Run the ETL process for a job created by ETLRunView"""
+    try:
+        run_etl_process(
+            batch_size=batch_size,
+            concurrency=concurrency,
+            job_id=job_id,
+            force_refresh=force_refresh,
+        )
+    except Exception as e:
+        logger.error(f"Background ETL process error: {e}")
+        ETLProcessingLog.objects.filter(id=job_id).update(
+            status="failed",
+            process_end=timezone.now(),
+            errors_encountered=orjson.dumps([str(e)]).decode(),
+        )
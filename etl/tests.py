@@ -2,19 +2,48 @@
 Unit Tests for Animal ETL System
 """
 
+import importlib.util
+import logging
+import os
+import tempfile
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import Mock, patch
 
-from requests.exceptions import HTTPError
+import orjson
+from django.test import TestCase
+from requests.exceptions import ConnectionError, HTTPError
+from tenacity import wait_none
 
+from .models import Animal, APIErrorLog, ETLProcessingLog
+from .tasks import run_etl_background
 from .utils.etl_service import (
+    CIRCUIT_BREAKERS,
+    DETAIL_WORKERS,
+    MAX_ERRORS,
+    STATS,
+    CircuitOpenError,
+    DeadlineExceeded,
     ETLError,
     ETLStats,
+    call_timeout,
+    deadline,
     fetch_paginated_animals,
     get_animal_details,
+    get_job_stats,
     is_server_error,
+    iter_completed,
+    make_circuit_breaker,
     post_animals_batch,
+    run_etl_process,
+    save_animals_to_db,
+    send_request,
     transform_animal,
+    transform_animals_batch,
+    wait_retry_after,
+    wait_within_deadline,
 )
 
 
@@ -36,6 +65,14 @@ class TestETLStats(unittest.TestCase):
         self.assertEqual(len(stats.errors), 1)
         self.assertIn("Test error", stats.errors[0])
 
+    def test_errors_are_bounded(self):
+        stats = ETLStats()
+        for i in range(MAX_ERRORS + 5):
+            stats.add_error(f"Error {i}")
+        self.assertEqual(len(stats.errors), MAX_ERRORS)
+        self.assertEqual(stats.error_count, MAX_ERRORS + 5)
+        self.assertIn(f"Error {MAX_ERRORS + 4}", stats.errors[-1])
+
     def test_complete(self):
         stats = ETLStats()
         stats.complete()
@@ -98,6 +135,14 @@ class TestAnimalTransformation(unittest.TestCase):
         self.assertTrue(transformed["born_at"].endswith("+00:00"))
         self.assertIn("2021-01-01", transformed["born_at"])
 
+    def test_transform_born_at_milliseconds_precision(self):
+        """Test sub-second milliseconds are kept exactly"""
+        animal = {"id": 1, "name": "Buddy", "born_at": 1609459200123}
+
+        transformed = transform_animal(animal)
+
+        self.assertEqual(transformed["born_at"], "2021-01-01T00:00:00.123000+00:00")
+
     def test_transform_born_at_iso_string(self):
         """Test born_at transformation from ISO string"""
         animal = {"id": 1, "name": "Buddy", "born_at": "2021-01-01T00:00:00Z"}
@@ -131,15 +176,31 @@ class TestAnimalTransformation(unittest.TestCase):
         self.assertEqual(transformed["species"], "Dog")
         self.assertEqual(transformed["age"], 3)
 
+    def test_transform_batch_leaves_input_untouched(self):
+        """Test batch transformation returns new dicts in input order"""
+        animals = [
+            {"id": 1, "friends": "Max,Luna", "born_at": "2021-01-01T00:00:00Z"},
+            {"id": 2, "friends": "", "born_at": 1609459200000},
+        ]
+
+        transformed = transform_animals_batch(animals)
+
+        self.assertEqual([a["id"] for a in transformed], [1, 2])
+        self.assertEqual(transformed[0]["friends"], ["Max", "Luna"])
+        self.assertEqual(transformed[0]["born_at"], "2021-01-01T00:00:00+00:00")
+        self.assertEqual(transformed[1]["born_at"], "2021-01-01T00:00:00+00:00")
+        self.assertEqual(animals[0]["friends"], "Max,Luna")
+        self.assertEqual(animals[1]["born_at"], 1609459200000)
+
 
 class TestAPIFunctions(unittest.TestCase):
     """Test API interaction functions"""
 
-    @patch("etl.utils.etl_service.requests.get")
+    @patch("etl.utils.etl_service.SESSION.get")
     def test_get_animal_details_success(self, mock_get):
         """Test successful animal details fetch"""
         mock_response = Mock()
-        mock_response.json.return_value = {"id": 1, "name": "Buddy", "species": "Dog"}
+        mock_response.content = b'{"id": 1, "name": "Buddy", "species": "Dog"}'
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -151,7 +212,32 @@ class TestAPIFunctions(unittest.TestCase):
             "http://localhost:3123/animals/v1/animals/1", timeout=30
         )
 
-    @patch("etl.utils.etl_service.requests.get")
+    @patch("etl.utils.etl_service.SESSION.get")
+    @patch("etl.utils.etl_service.get_redis_client")
+    def test_get_animal_details_uses_redis(self, mock_client, mock_get):
+        """Test details cached in Redis are returned without an API call"""
+        mock_client.return_value.get.return_value = b'{"id": 8, "name": "Tom"}'
+
+        result = get_animal_details(8)
+
+        self.assertEqual(result["name"], "Tom")
+        mock_client.return_value.get.assert_called_once_with("animal:8")
+        mock_get.assert_not_called()
+
+    @patch("etl.utils.etl_service.SESSION.get")
+    @patch("etl.utils.etl_service.get_redis_client")
+    def test_get_animal_details_bypasses_caches(self, mock_client, mock_get):
+        """Test use_cache=False skips Redis and refreshes it from the API"""
+        mock_client.return_value.get.return_value = b'{"id": 8, "name": "Tom"}'
+        mock_get.return_value.content = b'{"id": 8, "name": "Tommy"}'
+
+        result = get_animal_details(8, use_cache=False)
+
+        self.assertEqual(result["name"], "Tommy")
+        mock_client.return_value.get.assert_not_called()
+        mock_client.return_value.setex.assert_called_once()
+
+    @patch("etl.utils.etl_service.SESSION.get")
     def test_get_animal_details_404(self, mock_get):
         """Test animal details with 404 error"""
         mock_response = Mock()
@@ -166,7 +252,7 @@ class TestAPIFunctions(unittest.TestCase):
 
         self.assertIn("not found", str(context.exception))
 
-    @patch("etl.utils.etl_service.requests.post")
+    @patch("etl.utils.etl_service.SESSION.post")
     def test_post_animals_batch_success(self, mock_post):
         """Test successful batch posting"""
         mock_response = Mock()
@@ -179,6 +265,7 @@ class TestAPIFunctions(unittest.TestCase):
 
         self.assertEqual(result, 200)
         mock_post.assert_called_once()
+        self.assertEqual(orjson.loads(mock_post.call_args.kwargs["data"]), batch)
 
     def test_post_animals_batch_too_large(self):
         """Test batch size validation"""
@@ -215,9 +302,21 @@ class TestAPIFunctions(unittest.TestCase):
 
         result = fetch_paginated_animals()
 
-        self.assertEqual(set(result), {1, 2, 3, 4})
+        self.assertEqual(result, [1, 2, 3, 4])
         self.assertEqual(mock_fetch.call_count, 2)
 
+    @patch("etl.utils.etl_service.fetch_page_with_retry")
+    def test_fetch_paginated_animals_deduplicates_in_order(self, mock_fetch):
+        """Test IDs repeated across pages are returned once, in page order"""
+        mock_fetch.side_effect = lambda page: {
+            "items": [{"id": 3}, {"id": 1}] if page == 1 else [{"id": 1}, {"id": 2}],
+            "total_pages": 2,
+        }
+
+        result = fetch_paginated_animals()
+
+        self.assertEqual(result, [3, 1, 2])
+
     @patch("etl.utils.etl_service.fetch_page_with_retry")
     def test_fetch_paginated_animals_empty_response(self, mock_fetch):
         """Test pagination with no animals"""
@@ -227,6 +326,50 @@ class TestAPIFunctions(unittest.TestCase):
 
         self.assertEqual(result, [])
 
+    @patch("etl.utils.etl_service.PAGE_DEADLINE", 0.05)
+    @patch("etl.utils.etl_service.send_request")
+    def test_fetch_paginated_animals_restarts_after_page_deadline(self, mock_send):
+        """Test a page whose deadline expires mid-retry restarts the listing"""
+        page = Mock(headers={})
+        page.content = orjson.dumps({"items": [{"id": 1}], "total_pages": 1})
+        mock_send.side_effect = [HTTPError(response=Mock(status_code=503)), page]
+
+        result = fetch_paginated_animals.retry_with(wait=wait_none())()
+
+        self.assertEqual(result, [1])
+        self.assertEqual(mock_send.call_count, 2)
+
+
+class TestBoundedSubmission(unittest.TestCase):
+    """Test detail fetches are submitted through a bounded window"""
+
+    def test_iter_completed_bounds_pending_calls(self):
+        """Test no more than max_pending calls are ever submitted at once"""
+        executor = Mock()
+        submitted = []
+
+        def submit(fn, item):
+            future = Mock()
+            future.result.return_value = fn(item)
+            submitted.append(future)
+            return future
+
+        executor.submit.side_effect = submit
+
+        def fake_wait(pending, return_when):
+            self.assertLessEqual(len(pending), 3)
+            return set(list(pending)[:1]), set()
+
+        with patch("etl.utils.etl_service.wait", side_effect=fake_wait):
+            results = [
+                (item, future.result())
+                for item, future in iter_completed(executor, str, range(10), 3)
+            ]
+
+        self.assertEqual(sorted(item for item, _ in results), list(range(10)))
+        self.assertEqual(dict(results)[4], "4")
+        self.assertEqual(len(submitted), 10)
+
 
 class TestErrorHandling(unittest.TestCase):
     """Test error handling and retry logic"""
@@ -255,6 +398,368 @@ class TestErrorHandling(unittest.TestCase):
 
         self.assertFalse(is_server_error(error))
 
+    def test_wait_honors_retry_after(self):
+        """Test 429 responses wait for Retry-After, other errors back off"""
+        wait = wait_retry_after(lambda retry_state: 1.5)
+        rate_limited = HTTPError(response=Mock(status_code=429))
+        rate_limited.response.headers = {"Retry-After": "7"}
+        negative = HTTPError(response=Mock(status_code=429))
+        negative.response.headers = {"Retry-After": "-5"}
+        server_error = HTTPError(response=Mock(status_code=503))
+
+        cases = ((rate_limited, 7.0), (negative, 0.0), (server_error, 1.5))
+        for exc, expected in cases:
+            retry_state = Mock()
+            retry_state.outcome.exception.return_value = exc
+            self.assertEqual(wait(retry_state), expected)
+
+    def test_call_timeout_shrinks_to_deadline(self):
+        """Test request timeouts never outlast the enclosing deadline"""
+        self.assertEqual(call_timeout(30), 30)
+
+        with deadline(5):
+            self.assertLessEqual(call_timeout(30), 5)
+            with deadline(60):
+                self.assertLessEqual(call_timeout(30), 5)
+
+    def test_wait_is_clamped_to_deadline(self):
+        """Test backoff never sleeps past the enclosing deadline"""
+        wait = wait_within_deadline(lambda retry_state: 60)
+
+        self.assertEqual(wait(Mock()), 60)
+        with deadline(2):
+            self.assertLessEqual(wait(Mock()), 2)
+        with deadline(-1):
+            self.assertEqual(wait(Mock()), 0)
+
+    @patch("etl.utils.etl_service.SESSION.get")
+    def test_expired_deadline_skips_request(self, mock_get):
+        """Test no request is sent once the deadline has passed"""
+        with deadline(0):
+            with self.assertRaises(DeadlineExceeded):
+                get_animal_details(5)
+
+        mock_get.assert_not_called()
+
+    @patch("etl.utils.etl_service.BREAKER_FAIL_MAX", 2)
+    def test_circuit_opens_after_repeated_failures(self):
+        """Test an open circuit fails fast without calling the endpoint"""
+        breaker = make_circuit_breaker("/animals/v1/home")
+        method = Mock(side_effect=ConnectionError("refused"))
+
+        with patch.dict(CIRCUIT_BREAKERS, {"/animals/v1/home": breaker}):
+            for _ in range(2):
+                with self.assertRaises(ConnectionError):
+                    send_request("/animals/v1/home", method, "http://test")
+            with self.assertRaises(CircuitOpenError):
+                send_request("/animals/v1/home", method, "http://test")
+
+        self.assertEqual(method.call_count, 2)
+
+    def test_calls_through_breaker_run_concurrently(self):
+        """Test the breaker does not serialize requests to its endpoint"""
+        breaker = make_circuit_breaker("/animals/v1/animals")
+        barrier = threading.Barrier(5, timeout=5)
+
+        def method(url, **kwargs):
+            barrier.wait()  # Breaks unless all five calls are in flight at once
+            return Mock()
+
+        with patch.dict(CIRCUIT_BREAKERS, {"/animals/v1/animals": breaker}):
+            with ThreadPoolExecutor(max_workers=5) as executor:
+                futures = [
+                    executor.submit(send_request, "/animals/v1/animals", method, "x")
+                    for _ in range(5)
+                ]
+                for future in futures:
+                    future.result()
+
+        self.assertEqual(breaker.current_state, "closed")
+
+    def test_circuit_ignores_client_errors(self):
+        """Test 4xx responses do not count towards opening the circuit"""
+        breaker = make_circuit_breaker("/animals/v1/animals")
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.raise_for_status.side_effect = HTTPError(response=mock_response)
+        method = Mock(return_value=mock_response)
+
+        with patch.dict(CIRCUIT_BREAKERS, {"/animals/v1/animals": breaker}):
+            for _ in range(15):
+                with self.assertRaises(HTTPError):
+                    send_request("/animals/v1/animals", method, "http://test")
+
+        self.assertEqual(breaker.current_state, "closed")
+
+
+class TestSaveAnimalsToDB(TestCase):
+    """Test bulk persistence of processed animals"""
+
+    def test_save_animals_upserts_existing_rows(self):
+        """Test new animals are inserted and existing ones updated in bulk"""
+        Animal.objects.create(api_id=1, name="Old", species="Cat", friends_raw="")
+        raws = [
+            {"id": 1, "name": "Buddy", "species": "Dog", "friends": "Max"},
+            {"id": 2, "name": "Luna", "species": "Cat", "born_at": 1609459200},
+        ]
+
+        save_animals_to_db(
+            [{"raw": raw, "transformed": transform_animal(raw)} for raw in raws]
+        )
+
+        self.assertEqual(Animal.objects.count(), 2)
+        buddy = Animal.objects.get(api_id=1)
+        self.assertEqual(buddy.name, "Buddy")
+        self.assertEqual(buddy.friends, ["Max"])
+        self.assertTrue(buddy.is_sent_to_home)
+        self.assertEqual(Animal.objects.get(api_id=2).born_at.year, 2021)
+
+
+class TestErrorLogBuffering(TestCase):
+    """Test failed animals are logged to the database in bulk"""
+
+    @patch("etl.utils.etl_service.get_animal_details")
+    @patch("etl.utils.etl_service.fetch_paginated_animals")
+    def test_failed_animals_are_logged(self, mock_fetch_ids, mock_get_details):
+        """Test every failed animal gets an APIErrorLog row"""
+        mock_fetch_ids.return_value = [1, 2, 3]
+        mock_get_details.side_effect = ETLError("not found")
+
+        with patch.object(
+            APIErrorLog.objects, "create", side_effect=AssertionError
+        ) as mock_create:
+            stats = run_etl_process()
+
+        mock_create.assert_not_called()
+        self.assertEqual(stats.error_count, 3)
+        self.assertEqual(APIErrorLog.objects.filter(error_type="ETLError").count(), 3)
+
+
+class TestBackgroundJobs(TestCase):
+    """Test ETL jobs started from the web UI run on the task queue"""
+
+    @patch("etl.views.run_etl_background.delay")
+    def test_run_view_queues_task(self, mock_delay):
+        """Test the run endpoint creates a job and queues it"""
+        response = self.client.post(
+            "/etl/run/", data=b'{"batch_size": 50}', content_type="application/json"
+        )
+
+        job_id = response.json()["job_id"]
+        self.assertEqual(ETLProcessingLog.objects.get(id=job_id).status, "running")
+        mock_delay.assert_called_once_with(job_id, 50, DETAIL_WORKERS, False)
+
+    @patch("etl.tasks.run_etl_process")
+    def test_task_runs_etl_for_its_job(self, mock_run):
+        """Test the task records the run on the job created by the view"""
+        job = ETLProcessingLog.objects.create(status="running")
+
+        run_etl_background(job.id, 50)
+
+        mock_run.assert_called_once_with(
+            batch_size=50,
+            concurrency=DETAIL_WORKERS,
+            job_id=job.id,
+            force_refresh=False,
+        )
+
+    @patch("etl.tasks.run_etl_process", side_effect=RuntimeError("boom"))
+    def test_task_marks_job_failed(self, mock_run):
+        """Test a crashed run leaves its job marked as failed"""
+        job = ETLProcessingLog.objects.create(status="running")
+
+        run_etl_background(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("boom", job.errors_encountered)
+
+
+class TestJobStatus(TestCase):
+    """Test ETL progress is reported per job"""
+
+    def setUp(self):
+        # Job ids are reused between tests, so start without live stats
+        patcher = patch.dict(STATS, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("etl.utils.etl_service.get_animal_details")
+    @patch("etl.utils.etl_service.fetch_paginated_animals")
+    def test_run_reports_on_given_job(self, mock_fetch_ids, mock_get_details):
+        """Test a run updates its own job and live stats only"""
+        mock_fetch_ids.return_value = [1, 2]
+        mock_get_details.side_effect = ETLError("not found")
+        job = ETLProcessingLog.objects.create(status="running")
+        other = ETLProcessingLog.objects.create(status="running")
+
+        stats = run_etl_process(job_id=job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "partial")
+        self.assertEqual(job.total_animals_fetched, 2)
+        self.assertIs(get_job_stats(job.id), stats)
+        self.assertIsNone(get_job_stats(other.id))
+        self.assertEqual(ETLProcessingLog.objects.count(), 2)
+
+    @patch("etl.utils.etl_service.get_animal_details")
+    @patch("etl.utils.etl_service.fetch_paginated_animals")
+    def test_run_skips_animals_already_sent(self, mock_fetch_ids, mock_get_details):
+        """Test animals sent by an earlier run are not fetched again"""
+        Animal.objects.create(api_id=1, name="Rex", species="Dog", friends_raw="")
+        Animal.objects.filter(api_id=1).update(is_sent_to_home=True)
+        mock_fetch_ids.return_value = [1, 2]
+        mock_get_details.side_effect = ETLError("not found")
+
+        stats = run_etl_process()
+        mock_get_details.assert_called_once_with(2, use_cache=True)
+        self.assertEqual(stats.animals_skipped, 1)
+
+        mock_get_details.reset_mock()
+        run_etl_process(force_refresh=True)
+        self.assertEqual(mock_get_details.call_count, 2)
+        mock_get_details.assert_called_with(2, use_cache=False)
+
+    @patch("etl.utils.etl_service.get_animal_details")
+    @patch("etl.utils.etl_service.fetch_paginated_animals")
+    def test_run_without_cache(self, mock_fetch_ids, mock_get_details):
+        """Test use_cache=False fetches details without reading Redis"""
+        mock_fetch_ids.return_value = [1]
+        mock_get_details.side_effect = ETLError("not found")
+
+        run_etl_process(use_cache=False)
+
+        mock_get_details.assert_called_once_with(1, use_cache=False)
+
+    def test_status_rejects_non_numeric_job_id(self):
+        """Test a malformed job_id is a client error, not a server error"""
+        response = self.client.get("/etl/status/?job_id=abc")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_status_falls_back_to_job_row(self):
+        """Test status of a job run elsewhere is read from its log row"""
+        job = ETLProcessingLog.objects.create(
+            status="completed",
+            total_animals_fetched=10,
+            total_animals_processed=10,
+            total_animals_sent=8,
+            batches_posted=1,
+            errors_encountered="a\nb",
+        )
+
+        response = self.client.get(f"/etl/status/?job_id={job.id}")
+
+        data = response.json()
+        self.assertEqual(data["step"], "Completed")
+        self.assertEqual(data["posted"], 8)
+        self.assertEqual(data["errors"], 2)
+
+    @patch("etl.utils.etl_service.get_animal_details")
+    @patch("etl.utils.etl_service.fetch_paginated_animals")
+    def test_status_fallback_reports_skipped(self, mock_fetch_ids, mock_get_details):
+        """Test animals skipped by a run elsewhere are read from its log row"""
+        Animal.objects.create(api_id=1, name="Rex", species="Dog", friends_raw="")
+        Animal.objects.filter(api_id=1).update(is_sent_to_home=True)
+        mock_fetch_ids.return_value = [1, 2]
+        mock_get_details.side_effect = ETLError("not found")
+        job = ETLProcessingLog.objects.create(status="running")
+
+        run_etl_process(job_id=job.id)
+        STATS.clear()
+        response = self.client.get(f"/etl/status/?job_id={job.id}")
+
+        self.assertEqual(response.json()["skipped"], 1)
+
+
+class TestDashboard(TestCase):
+    """Test the dashboard animal table"""
+
+    def test_dashboard_keyset_pagination(self):
+        """Test pages continue after the cursor without overlap"""
+        Animal.objects.bulk_create(
+            Animal(api_id=i, name=f"Animal {i}", species="Dog", friends_raw="")
+            for i in range(30)
+        )
+
+        first = self.client.get("/etl/")
+        cursor = first.context["next_cursor"]
+        second = self.client.get("/etl/", cursor)
+
+        first_ids = [a.api_id for a in first.context["animals"]]
+        second_ids = [a.api_id for a in second.context["animals"]]
+        self.assertEqual(len(first_ids), 25)
+        self.assertEqual(len(second_ids), 5)
+        self.assertEqual(set(first_ids + second_ids), set(range(30)))
+        self.assertIsNone(second.context["next_cursor"])
+
+
+class TestStandaloneScript(unittest.TestCase):
+    """Test the checkpoint/resume logic of the standalone animal_etl.py script"""
+
+    @classmethod
+    def setUpClass(cls):
+        # The animal_etl settings package shadows the script, so load it by
+        # path, inside a scratch directory for its log file and disk cache
+        tmp = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(tmp.cleanup)
+        root = logging.getLogger()
+        handlers, level = list(root.handlers), root.level
+        cwd = os.getcwd()
+        os.chdir(tmp.name)
+        try:
+            spec = importlib.util.spec_from_file_location(
+                "animal_etl_script",
+                Path(__file__).resolve().parent.parent / "animal_etl.py",
+            )
+            cls.script = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(cls.script)
+        finally:
+            os.chdir(cwd)
+            for handler in set(root.handlers) - set(handlers):
+                root.removeHandler(handler)
+                handler.close()
+            root.setLevel(level)
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.done_path = Path(tmp.name) / "done.txt"
+        patcher = patch.object(self.script, "DONE_PATH", self.done_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_checkpoint_round_trip(self):
+        """Test checkpointed IDs are read back by the next run"""
+        self.assertEqual(self.script.load_done_ids(), set())
+
+        self.script.checkpoint_done_ids([{"id": 1}, {"id": 2}])
+        self.script.checkpoint_done_ids([{"id": 3}])
+
+        self.assertEqual(self.script.load_done_ids(), {1, 2, 3})
+
+    def test_resume_skips_checkpointed_ids(self):
+        """Test a resumed run only fetches and posts animals not yet posted"""
+        self.script.checkpoint_done_ids([{"id": 1}, {"id": 2}])
+        fetch = Mock(side_effect=lambda animal_id: {"id": animal_id, "friends": ""})
+        post = Mock()
+
+        with patch.object(
+            self.script, "iter_animal_ids", return_value=iter([[1, 2, 3]])
+        ), patch.object(
+            self.script, "fetch_animal_details_cached", fetch
+        ), patch.object(
+            self.script, "post_animals_batch", post
+        ):
+            stats = self.script.run_etl_process(resume=True)
+
+        fetch.assert_called_once_with(3)
+        self.assertEqual(post.call_args[0][0], [{"id": 3, "friends": []}])
+        self.assertEqual(stats.animals_skipped, 2)
+        self.assertEqual(stats.animals_posted, 1)
+        # A run without errors clears the checkpoint for the next full run
+        self.assertFalse(self.done_path.exists())
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for complete workflows"""
@@ -268,7 +773,7 @@ class TestIntegration(unittest.TestCase):
 
         mock_fetch_ids.return_value = [1, 2]
 
-        def mock_details(animal_id):
+        def mock_details(animal_id, use_cache=True):
             return {
                 "id": animal_id,
                 "name": f"Animal {animal_id}",
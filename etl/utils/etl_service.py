@@ -1,24 +1,73 @@
 import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Dict, List
+from datetime import timezone as dt_timezone
+from functools import partial
+from itertools import islice
+from typing import Any, Dict, List, Optional
 
-import pytz
+import orjson
+import pybreaker
 import requests
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError, RequestException
 from tenacity import (
     retry,
     retry_if_exception,
     retry_if_exception_type,
     stop_after_attempt,
-    wait_exponential,
+    wait_exponential_jitter,
 )
+from urllib3.util import make_headers
 
 from etl.models import Animal, APIErrorLog, ETLProcessingLog
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "http://localhost:3123"
+MAX_ERRORS = 1000
+DETAIL_WORKERS = 20
+POST_WORKERS = 4
+ERROR_LOG_BATCH_SIZE = 500
+DETAIL_CACHE_TTL = 4 * 60 * 60
+STATS_TTL = 60 * 60
+MAX_CONCURRENCY = 200
+BREAKER_FAIL_MAX = 10
+BREAKER_RESET_TIMEOUT = 30
+RETRY_AFTER_MAX = 60
+PAGE_DEADLINE = 300
+DETAIL_DEADLINE = 60
+POST_DEADLINE = 120
+
+_UTC = dt_timezone.utc
+_MS_CUTOFF = 10_000_000_000
+
+SESSION = requests.Session()
+adapter = HTTPAdapter(pool_connections=32, pool_maxsize=MAX_CONCURRENCY, max_retries=0)
+SESSION.mount("http://", adapter)
+SESSION.mount("https://", adapter)
+# Only advertise encodings urllib3 can decode (br/zstd when their packages exist)
+SESSION.headers.update(make_headers(accept_encoding=True))
+
+ANIMAL_UPSERT_FIELDS = [
+    "name",
+    "species",
+    "age",
+    "friends_raw",
+    "born_at_raw",
+    "friends",
+    "born_at",
+    "is_processed",
+    "is_sent_to_home",
+]
 
 
 def is_server_error(exc):
@@ -28,13 +77,122 @@ def is_server_error(exc):
     )
 
 
-@retry(wait=wait_exponential(min=2, max=60), retry=retry_if_exception(is_server_error))
+def is_rate_limited(exc):
+    return (
+        isinstance(exc, requests.exceptions.HTTPError)
+        and exc.response.status_code == 429
+    )
+
+
+def wait_retry_after(fallback):
+    """
+    Tenacity wait that sleeps for the Retry-After seconds of a 429 response
+    (capped at RETRY_AFTER_MAX) and uses ``fallback`` for any other failure.
+    """
+
+    def wait_fn(retry_state):
+        exc = retry_state.outcome.exception()
+        if is_rate_limited(exc):
+            try:
+                retry_after = float(exc.response.headers["Retry-After"])
+                return max(0.0, min(retry_after, RETRY_AFTER_MAX))
+            except (KeyError, TypeError, ValueError):
+                pass
+        return fallback(retry_state)
+
+    return wait_fn
+
+
+# time.monotonic() value by which the current unit of work must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("etl_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float):
+    """
+    Bound all calls made inside the block, retries included, to ``seconds``.
+    Nested deadlines can only shorten the enclosing one.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline_remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None without one"""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def call_timeout(budget: float) -> float:
+    """
+    Timeout for a single request: its own budget, shrunk to what is left
+    of the current deadline.
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    remaining = deadline_remaining()
+    if remaining is None:
+        return budget
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline exceeded before request was sent")
+    return max(0.1, min(budget, remaining))
+
+
+def stop_after_deadline(retry_state):
+    """Tenacity stop condition: give up once the current deadline has passed"""
+    remaining = deadline_remaining()
+    return remaining is not None and remaining <= 0
+
+
+def wait_within_deadline(wait):
+    """Tenacity wait that never sleeps past the current deadline"""
+
+    def wait_fn(retry_state):
+        seconds = wait(retry_state)
+        remaining = deadline_remaining()
+        if remaining is None:
+            return seconds
+        return max(0.0, min(seconds, remaining))
+
+    return wait_fn
+
+
+def run_with_deadline(seconds: float, fn, *args, **kwargs):
+    """Call fn(*args, **kwargs) under a deadline; used to bound work in pool threads"""
+    with deadline(seconds):
+        return fn(*args, **kwargs)
+
+
+@retry(
+    stop=stop_after_deadline,
+    wait=wait_within_deadline(
+        wait_retry_after(wait_exponential_jitter(initial=2, max=60, jitter=2))
+    ),
+    retry=retry_if_exception(lambda exc: is_server_error(exc) or is_rate_limited(exc)),
+    reraise=True,
+)
 def fetch_page_with_retry(page):
-    resp = requests.get(
-        f"{BASE_URL}/animals/v1/animals", params={"page": page}, timeout=30
+    resp = send_request(
+        "/animals/v1/animals",
+        SESSION.get,
+        f"{BASE_URL}/animals/v1/animals",
+        params={"page": page},
+        timeout=call_timeout(30),
     )
-    resp.raise_for_status()
-    return resp.json()
+    if page == 1:
+        logger.info(
+            "Animal list Content-Encoding: "
+            f"{resp.headers.get('Content-Encoding', 'identity')}"
+        )
+    return orjson.loads(resp.content)
 
 
 class ETLError(Exception):
@@ -43,6 +201,83 @@ class ETLError(Exception):
     pass
 
 
+class CircuitOpenError(ETLError):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+    pass
+
+
+class DeadlineExceeded(ETLError):
+    """Raised instead of sending a request once its deadline has passed"""
+
+    pass
+
+
+def is_upstream_failure(exc):
+    """Only network errors and 5xx responses count towards opening a breaker."""
+    if isinstance(exc, HTTPError):
+        return is_server_error(exc)
+    return isinstance(exc, RequestException)
+
+
+def make_circuit_breaker(name: str) -> pybreaker.CircuitBreaker:
+    return pybreaker.CircuitBreaker(
+        fail_max=BREAKER_FAIL_MAX,
+        reset_timeout=BREAKER_RESET_TIMEOUT,
+        exclude=[lambda exc: not is_upstream_failure(exc)],
+        name=name,
+        throw_new_error_on_trip=False,
+    )
+
+
+# Breakers count every failed attempt, retries included, so a burst of 5xx
+# on a few animals can open one. While it is open, each remaining animal of
+# the run fails at once with CircuitOpenError and is logged, not retried;
+# rerun the job after BREAKER_RESET_TIMEOUT to pick those animals up.
+CIRCUIT_BREAKERS = {
+    endpoint: make_circuit_breaker(endpoint)
+    for endpoint in ("/animals/v1/animals", "/animals/v1/home")
+}
+
+# Maximum concurrent requests per endpoint across all runs in this process.
+# Detail fetches have none: a run's worker pool and iter_completed window
+# already bound them to its --concurrency.
+BULKHEADS = {
+    "/animals/v1/home": threading.BoundedSemaphore(POST_WORKERS * 2),
+}
+
+
+def send_request(endpoint: str, method, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request through the circuit breaker and, if it has one, the
+    bulkhead of the given endpoint.
+
+    Args:
+        endpoint (str): Key into CIRCUIT_BREAKERS
+        method: Session method to call, e.g. SESSION.get
+        url (str): Full request URL
+
+    Returns:
+        requests.Response: Response with a non-error status code
+
+    Raises:
+        CircuitOpenError: If the breaker is open; no request is sent
+    """
+
+    breaker = CIRCUIT_BREAKERS[endpoint]
+    try:
+        # calling() only holds the breaker's lock to check and update its
+        # state; breaker.call() would hold it for the whole request and
+        # serialize every call through the endpoint
+        with breaker.calling():
+            with BULKHEADS.get(endpoint, nullcontext()):
+                resp = method(url, **kwargs)
+            resp.raise_for_status()
+            return resp
+    except pybreaker.CircuitBreakerError as e:
+        raise CircuitOpenError(f"Circuit open for {endpoint}: {e}") from e
+
+
 class ETLStats:
     """Track ETL process statistics"""
 
@@ -54,13 +289,16 @@ class ETLStats:
         self.animals_processed = 0
         self.animals_posted = 0
         self.batches_posted = 0
-        self.errors = []
+        self.animals_skipped = 0
+        self.errors = deque(maxlen=MAX_ERRORS)
+        self.error_count = 0
         self.start_time = timezone.now()
         self.end_time = None
         self.current_step = "Initializing"
 
     def add_error(self, error: str):
         self.errors.append(f"{timezone.now()}: {error}")
+        self.error_count += 1
 
     def complete(self):
         self.end_time = timezone.now()
@@ -71,70 +309,133 @@ class ETLStats:
         return (end - self.start_time).total_seconds()
 
 
-etl_stats = ETLStats()
+# Live statistics of the runs in this process, keyed by ETLProcessingLog id
+STATS: Dict[int, ETLStats] = {}
+_stats_lock = threading.Lock()
+
+
+def register_stats(job_id: int) -> ETLStats:
+    """
+    Create the statistics for a job, evicting those of jobs that ended
+    more than STATS_TTL seconds ago.
+    """
+    now = timezone.now()
+    stats = ETLStats()
+    with _stats_lock:
+        for old_id, old_stats in list(STATS.items()):
+            if old_stats.end_time and (
+                (now - old_stats.end_time).total_seconds() > STATS_TTL
+            ):
+                del STATS[old_id]
+        STATS[job_id] = stats
+    return stats
+
+
+def get_job_stats(job_id: int) -> Optional[ETLStats]:
+    """Return the live statistics of a job run by this process, if any"""
+    return STATS.get(job_id)
 
 
 @retry(
     stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((RequestException, HTTPError)),
+    wait=wait_exponential_jitter(initial=2, max=10, jitter=2),
+    retry=retry_if_exception_type((RequestException, HTTPError, DeadlineExceeded)),
 )
-def fetch_paginated_animals() -> List[int]:
+def fetch_paginated_animals(stats: Optional[ETLStats] = None) -> List[int]:
     """
     Fetch all animal IDs from paginated API endpoint.
     Retries failed pages indefinitely until success.
+
+    The next page is requested in the background as soon as the current
+    one arrives, so parsing a page overlaps with the following request.
+
+    Args:
+        stats (ETLStats): Statistics of the run to report progress to
     """
-    animal_ids = []
+    if stats is None:
+        stats = ETLStats()
+
+    # dict keys de-duplicate IDs repeated across pages and keep API order
+    animal_ids: Dict[int, None] = {}
     page = 1
     total_pages = None
 
-    etl_stats.current_step = "Fetching animal list"
+    stats.current_step = "Fetching animal list"
     logger.info("Starting to fetch paginated animals")
 
-    while True:
-        try:
-            data = fetch_page_with_retry(page)
+    prefetcher = ThreadPoolExecutor(max_workers=1)
+    fetch_page = partial(run_with_deadline, PAGE_DEADLINE, fetch_page_with_retry)
+    next_page = prefetcher.submit(fetch_page, page)
 
-            if isinstance(data, dict) and "items" in data:
-                items = data["items"]
-                total_pages = data.get("total_pages", total_pages)
+    try:
+        while True:
+            try:
+                data = next_page.result()
 
-                if not items:
-                    break
+                if isinstance(data, dict) and "items" in data:
+                    items = data["items"]
+                    total_pages = data.get("total_pages", total_pages)
 
-                page_ids = [item["id"] for item in items if "id" in item]
-                animal_ids.extend(page_ids)
+                    if not items:
+                        break
 
-                logger.info(
-                    f"Page {page}/{total_pages or '?'}: Found {len(page_ids)} animals"
-                )
+                    has_more = not total_pages or page < total_pages
+                    if has_more:
+                        next_page = prefetcher.submit(fetch_page, page + 1)
 
-                if total_pages and page >= total_pages:
-                    break
+                    page_ids = [item["id"] for item in items if "id" in item]
+                    animal_ids.update(dict.fromkeys(page_ids))
 
-                page += 1
-            else:
-                raise ETLError(f"Unexpected API response structure on page {page}")
+                    logger.info(
+                        f"Page {page}/{total_pages or '?'}: Found {len(page_ids)} animals"
+                    )
 
-        except Exception as e:
-            logger.error(f"Fatal error fetching page {page}: {e}")
-            etl_stats.add_error(f"Page {page} failed permanently: {str(e)}")
-            raise
+                    if not has_more:
+                        break
+
+                    page += 1
+                else:
+                    raise ETLError(f"Unexpected API response structure on page {page}")
+
+            except Exception as e:
+                logger.error(f"Fatal error fetching page {page}: {e}")
+                stats.add_error(f"Page {page} failed permanently: {str(e)}")
+                raise
+    finally:
+        # Don't block on a prefetch that is no longer needed after a failure
+        prefetcher.shutdown(wait=False, cancel_futures=True)
+
+    stats.total_animals_found = len(animal_ids)
+    logger.info(f"Total unique animals found: {len(animal_ids)}")
+    return list(animal_ids)
 
-    unique_ids = list(set(animal_ids))
-    etl_stats.total_animals_found = len(unique_ids)
-    logger.info(f"Total unique animals found: {len(unique_ids)}")
-    return unique_ids
+
+_redis_client = None
+
+
+def get_redis_client():
+    """Return a client for settings.ETL_REDIS_URL, or None if it is not set."""
+    global _redis_client
+    redis_url = getattr(settings, "ETL_REDIS_URL", None)
+    if not redis_url:
+        return None
+    if _redis_client is None:
+        import redis
+
+        _redis_client = redis.Redis.from_url(redis_url)
+    return _redis_client
 
 
 @retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=1, max=8),
+    stop=stop_after_attempt(5) | stop_after_deadline,
+    wait=wait_within_deadline(
+        wait_retry_after(wait_exponential_jitter(initial=1, max=8, jitter=1))
+    ),
     retry=retry_if_exception_type((RequestException, HTTPError)),
 )
-def get_animal_details(animal_id: int) -> Dict[str, Any]:
+def fetch_animal_details(animal_id: int) -> Dict[str, Any]:
     """
-    Fetch detailed information for a specific animal.
+    Fetch detailed information for a specific animal from the API.
 
     Args:
         animal_id (int): The ID of the animal
@@ -147,9 +448,13 @@ def get_animal_details(animal_id: int) -> Dict[str, Any]:
     """
     try:
         logger.debug(f"Fetching details for animal {animal_id}")
-        resp = requests.get(f"{BASE_URL}/animals/v1/animals/{animal_id}", timeout=30)
-        resp.raise_for_status()
-        return resp.json()
+        resp = send_request(
+            "/animals/v1/animals",
+            SESSION.get,
+            f"{BASE_URL}/animals/v1/animals/{animal_id}",
+            timeout=call_timeout(30),
+        )
+        return orjson.loads(resp.content)
     except requests.exceptions.Timeout:
         logger.warning(f"Timeout fetching animal {animal_id}, retrying...")
         raise
@@ -162,66 +467,130 @@ def get_animal_details(animal_id: int) -> Dict[str, Any]:
             raise
         logger.error(f"HTTP error fetching animal {animal_id}: {e}")
         raise
+    except (CircuitOpenError, DeadlineExceeded):
+        raise
     except Exception as e:
         logger.error(f"Unexpected error fetching animal {animal_id}: {e}")
         raise ETLError(f"Failed to fetch animal {animal_id}: {str(e)}")
 
 
-def transform_animal(animal: Dict[str, Any]) -> Dict[str, Any]:
+def get_animal_details(animal_id: int, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Get animal details, reusing earlier responses where possible.
+
+    When ETL_REDIS_URL is set, details are cached in Redis for
+    DETAIL_CACHE_TTL seconds so that reruns skip the API.
+
+    Args:
+        animal_id (int): The ID of the animal
+        use_cache (bool): Read from Redis; when False the API is always
+            called and Redis is refreshed with the response
+
+    Returns:
+        Dict[str, Any]: Animal details
+    """
+    client = get_redis_client()
+    cache_key = f"animal:{animal_id}"
+
+    details = None
+    if client is not None and use_cache:
+        try:
+            cached = client.get(cache_key)
+            if cached is not None:
+                details = orjson.loads(cached)
+        except Exception as e:
+            logger.warning(f"Redis lookup failed for animal {animal_id}: {e}")
+
+    if details is None:
+        details = fetch_animal_details(animal_id)
+
+        if client is not None:
+            try:
+                client.setex(cache_key, DETAIL_CACHE_TTL, orjson.dumps(details))
+            except Exception as e:
+                logger.warning(f"Redis write failed for animal {animal_id}: {e}")
+
+    return details
+
+
+def transform_animals_batch(animals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Transform animal data according to requirements:
+    Transform a batch of animals according to requirements:
     1. Convert friends from comma-delimited string to array
     2. Convert born_at timestamp to ISO8601 UTC format
 
+    The input dicts are left untouched, since raw details may be shared
+    through the details cache.
+
     Args:
-        animal (Dict[str, Any]): Raw animal data
+        animals (List[Dict[str, Any]]): Raw animal data
 
     Returns:
-        Dict[str, Any]: Transformed animal data
+        List[Dict[str, Any]]: Transformed animal data, in input order
     """
-    transformed = animal.copy()
+    transformed_batch = []
+    for animal in animals:
+        friends = animal.get("friends")
+        if not friends:
+            friends = []
+        elif isinstance(friends, str):
+            friends = [f.strip() for f in friends.split(",") if f.strip()]
+
+        transformed = {**animal, "friends": friends}
+
+        born_at = animal.get("born_at")
+        if born_at:
+            try:
+                if isinstance(born_at, (int, float)):
+                    if born_at > _MS_CUTOFF:
+                        born_at = born_at / 1000
+                    dt = datetime.fromtimestamp(born_at, tz=_UTC)
+                elif (
+                    isinstance(born_at, str)
+                    and born_at.endswith("Z")
+                    and "+" not in born_at
+                    and born_at.count("-") <= 2
+                ):
+                    # Already UTC: parse without the suffix, skip the conversion
+                    dt = datetime.fromisoformat(born_at[:-1]).replace(tzinfo=_UTC)
+                elif isinstance(born_at, str):
+                    dt = datetime.fromisoformat(born_at.replace("Z", "+00:00"))
+                    if dt.tzinfo is None:
+                        dt = dt.replace(tzinfo=_UTC)
+                    else:
+                        dt = dt.astimezone(_UTC)
+                else:
+                    logger.warning(f"Unexpected born_at format: {type(born_at)}")
+                    dt = None
 
-    if "friends" in transformed and transformed["friends"]:
-        if isinstance(transformed["friends"], str):
-            friends_list = [
-                f.strip() for f in transformed["friends"].split(",") if f.strip()
-            ]
-            transformed["friends"] = friends_list
-    else:
-        transformed["friends"] = []
+                if dt:
+                    transformed["born_at"] = dt.isoformat()
+            except Exception as e:
+                logger.warning(f"Failed to transform born_at field: {e}")
 
-    if "born_at" in transformed and transformed["born_at"]:
-        try:
-            if isinstance(transformed["born_at"], (int, float)):
-                timestamp = transformed["born_at"]
-                if timestamp > 1e10:
-                    timestamp = timestamp / 1000
-                dt = datetime.fromtimestamp(timestamp, tz=pytz.UTC)
-            elif isinstance(transformed["born_at"], str):
-                dt = datetime.fromisoformat(
-                    transformed["born_at"].replace("Z", "+00:00")
-                )
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=pytz.UTC)
-                else:
-                    dt = dt.astimezone(pytz.UTC)
-            else:
-                logger.warning(
-                    f"Unexpected born_at format: {type(transformed['born_at'])}"
-                )
-                dt = None
+        transformed_batch.append(transformed)
 
-            if dt:
-                transformed["born_at"] = dt.isoformat()
-        except Exception as e:
-            logger.warning(f"Failed to transform born_at field: {e}")
+    return transformed_batch
 
-    return transformed
+
+def transform_animal(animal: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Transform a single animal, see transform_animals_batch.
+
+    Args:
+        animal (Dict[str, Any]): Raw animal data
+
+    Returns:
+        Dict[str, Any]: Transformed animal data
+    """
+    return transform_animals_batch([animal])[0]
 
 
 @retry(
-    stop=stop_after_attempt(5),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
+    stop=stop_after_attempt(5) | stop_after_deadline,
+    wait=wait_within_deadline(
+        wait_retry_after(wait_exponential_jitter(initial=2, max=10, jitter=2))
+    ),
     retry=retry_if_exception_type((RequestException, HTTPError)),
 )
 def post_animals_batch(batch: List[Dict[str, Any]]) -> int:
@@ -242,15 +611,14 @@ def post_animals_batch(batch: List[Dict[str, Any]]) -> int:
 
     try:
         logger.info(f"Posting batch of {len(batch)} animals")
-        resp = requests.post(
+        resp = send_request(
+            "/animals/v1/home",
+            SESSION.post,
             f"{BASE_URL}/animals/v1/home",
-            json=batch,
-            timeout=60,
+            data=orjson.dumps(batch),
+            timeout=call_timeout(60),
             headers={"Content-Type": "application/json"},
         )
-        resp.raise_for_status()
-        etl_stats.batches_posted += 1
-        etl_stats.animals_posted += len(batch)
         logger.info(f"Successfully posted batch of {len(batch)} animals")
         return resp.status_code
     except requests.exceptions.Timeout:
@@ -261,6 +629,8 @@ def post_animals_batch(batch: List[Dict[str, Any]]) -> int:
         if hasattr(e.response, "text"):
             logger.error(f"Response content: {e.response.text}")
         raise
+    except (CircuitOpenError, DeadlineExceeded):
+        raise
     except Exception as e:
         logger.error(f"Unexpected error posting batch: {e}")
         raise ETLError(f"Failed to post batch: {str(e)}")
@@ -269,143 +639,310 @@ def post_animals_batch(batch: List[Dict[str, Any]]) -> int:
 def save_animals_to_db(animals_data: List[Dict[str, Any]]) -> None:
     """
     Save animals to database using bulk operations for performance.
-    Only saves animals that don't already exist (based on api_id).
+    Animals that already exist (based on api_id) are updated in the same
+    INSERT ... ON CONFLICT statement instead of being queried first.
 
     Args:
-        animals_data: List of tuples (raw_data, transformed_data)
+        animals_data: List of dicts with "raw" and "transformed" animal data
     """
     if not animals_data:
         return
 
-    api_ids = [data["raw"]["id"] for data in animals_data]
-    existing_ids = set(
-        Animal.objects.filter(api_id__in=api_ids).values_list("api_id", flat=True)
-    )
-
-    new_animals = []
+    animals = []
     for data in animals_data:
         raw = data["raw"]
         transformed = data["transformed"]
 
-        if raw["id"] not in existing_ids:
-            new_animals.append(
-                Animal(
-                    api_id=raw.get("id"),
-                    name=raw.get("name", "Unknown"),
-                    species=raw.get("species", "Unknown"),
-                    age=raw.get("age"),
-                    friends_raw=raw.get("friends", ""),
-                    born_at_raw=raw.get("born_at"),
-                    friends=transformed.get("friends", []),
-                    born_at=transformed.get("born_at"),
-                    is_processed=True,
-                    is_sent_to_home=True,
+        animals.append(
+            Animal(
+                api_id=raw.get("id"),
+                name=raw.get("name", "Unknown"),
+                species=raw.get("species", "Unknown"),
+                age=raw.get("age"),
+                friends_raw=raw.get("friends", ""),
+                born_at_raw=raw.get("born_at"),
+                friends=transformed.get("friends", []),
+                born_at=transformed.get("born_at"),
+                is_processed=True,
+                is_sent_to_home=True,
+            )
+        )
+
+    with transaction.atomic():
+        Animal.objects.bulk_create(
+            animals,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["api_id"],
+            update_fields=ANIMAL_UPSERT_FIELDS,
+        )
+    logger.info(f"Saved {len(animals)} animals to database")
+
+
+def flush_error_logs(error_logs: List[APIErrorLog], force: bool = False) -> None:
+    """
+    Bulk insert buffered APIErrorLog rows once a full batch has built up.
+
+    Args:
+        error_logs: Buffer of unsaved APIErrorLog instances, emptied in place
+        force: Insert whatever is buffered, e.g. at the end of a run
+    """
+    if not error_logs or (not force and len(error_logs) < ERROR_LOG_BATCH_SIZE):
+        return
+
+    APIErrorLog.objects.bulk_create(error_logs, batch_size=ERROR_LOG_BATCH_SIZE)
+    error_logs.clear()
+
+
+def iter_completed(executor: ThreadPoolExecutor, fn, items, max_pending: int):
+    """
+    Submit fn(item) for each item, keeping at most max_pending calls queued
+    or running, and yield (item, future) pairs as the calls complete.
+    """
+    items = iter(items)
+    pending = {executor.submit(fn, item): item for item in islice(items, max_pending)}
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
+        for item in islice(items, max_pending - len(pending)):
+            pending[executor.submit(fn, item)] = item
+
+
+def submit_post_batch(
+    post_executor: ThreadPoolExecutor,
+    post_futures: Dict[Any, List],
+    raw_batch: List[Dict[str, Any]],
+) -> None:
+    """
+    Transform a batch of raw animals and hand its POST to the post executor.
+
+    Args:
+        post_executor: Executor running post_animals_batch
+        post_futures: Mapping of pending POST futures to their DB batches
+        raw_batch: Raw animal details, at most 100
+    """
+    transformed_batch = transform_animals_batch(raw_batch)
+    db_batch = [
+        {"raw": raw, "transformed": transformed}
+        for raw, transformed in zip(raw_batch, transformed_batch)
+    ]
+    post_future = post_executor.submit(
+        run_with_deadline, POST_DEADLINE, post_animals_batch, transformed_batch
+    )
+    post_futures[post_future] = db_batch
+
+
+def collect_posted_batches(
+    post_futures: Dict[Any, List],
+    error_logs: List[APIErrorLog],
+    stats: ETLStats,
+    block: bool = False,
+) -> None:
+    """
+    Record finished batch POSTs and save their animals to the database.
+
+    Runs on the calling thread so that stats updates and DB writes never
+    happen inside the posting workers.
+
+    Args:
+        post_futures: Mapping of pending POST futures to their DB batches
+        error_logs: Buffer that failed POSTs are logged to
+        stats: Statistics of the run
+        block: Wait for every pending POST instead of only finished ones
+    """
+    if block:
+        finished = list(as_completed(list(post_futures)))
+    else:
+        finished = [future for future in post_futures if future.done()]
+
+    for future in finished:
+        db_batch = post_futures.pop(future)
+        try:
+            future.result()
+        except Exception as e:
+            logger.error(f"Failed to post batch of {len(db_batch)} animals: {e}")
+            stats.add_error(f"Batch post failed: {str(e)}")
+            error_logs.append(
+                APIErrorLog(
+                    endpoint="/animals/v1/home",
+                    error_type=type(e).__name__,
+                    error_message=str(e),
                 )
             )
+            continue
+
+        stats.batches_posted += 1
+        stats.animals_posted += len(db_batch)
+        save_animals_to_db(db_batch)
 
-    if new_animals:
-        Animal.objects.bulk_create(new_animals, batch_size=100, ignore_conflicts=True)
-        logger.info(f"Saved {len(new_animals)} new animals to database")
 
+def save_progress(etl_log: ETLProcessingLog, stats: ETLStats) -> None:
+    """Store the counters of a running job so other processes can report them"""
+    ETLProcessingLog.objects.filter(id=etl_log.id).update(
+        total_animals_fetched=stats.total_animals_found,
+        total_animals_processed=stats.animals_processed,
+        total_animals_sent=stats.animals_posted,
+        animals_skipped=stats.animals_skipped,
+        batches_posted=stats.batches_posted,
+    )
 
-def run_etl_process(batch_size: int = 100) -> ETLStats:
+
+def run_etl_process(
+    batch_size: int = 100,
+    concurrency: int = DETAIL_WORKERS,
+    job_id: Optional[int] = None,
+    force_refresh: bool = False,
+    use_cache: bool = True,
+) -> ETLStats:
     """
     Run the complete ETL process with independent DB insertion and posting.
-    All fetched animals are processed and posted regardless of DB presence.
+    Animals already sent to home by an earlier run are skipped before their
+    details are fetched, unless force_refresh is set.
+
+    Args:
+        batch_size (int): Number of animals per POST batch (max 100)
+        concurrency (int): Detail requests kept in flight (max MAX_CONCURRENCY)
+        job_id (int): Existing ETLProcessingLog to record the run on; a new
+            one is created when omitted
+        force_refresh (bool): Process every animal, including those sent before,
+            with details fetched from the API rather than the caches
+        use_cache (bool): Reuse details cached in Redis
 
     Returns:
-        ETLStats: Runtime statistics object.
+        ETLStats: Runtime statistics object, also available from
+        get_job_stats() while the run is in progress.
     """
-    etl_stats.reset()
-    etl_log = ETLProcessingLog.objects.create(status="running")
+    if job_id is None:
+        etl_log = ETLProcessingLog.objects.create(status="running")
+    else:
+        etl_log = ETLProcessingLog.objects.get(id=job_id)
+    stats = register_stats(etl_log.id)
+    error_logs: List[APIErrorLog] = []
 
     try:
         logger.info("Starting ETL process")
-        etl_stats.current_step = "Fetching animal IDs"
+        stats.current_step = "Fetching animal IDs"
 
-        all_ids = list(set(fetch_paginated_animals()))
-        etl_stats.total_animals_found = len(all_ids)
+        all_ids = fetch_paginated_animals(stats)
+        stats.total_animals_found = len(all_ids)
         etl_log.total_animals_fetched = len(all_ids)
 
         if not all_ids:
             logger.warning("No animals found to process")
-            etl_stats.current_step = "No data found"
+            stats.current_step = "No data found"
+            stats.end_time = timezone.now()
             etl_log.status = "completed"
             etl_log.process_end = timezone.now()
             etl_log.save()
-            return etl_stats
-
-        etl_stats.current_step = "Processing animals"
-
-        posting_batch = []
-        db_batch = []
-
-        logger.info(f"Processing all {len(all_ids)} animals")
-
-        for idx, animal_id in enumerate(all_ids, start=1):
-            try:
-                raw_details = get_animal_details(animal_id)
-                transformed_details = transform_animal(raw_details)
-
-                posting_batch.append(transformed_details)
-                db_batch.append(
-                    {"raw": raw_details, "transformed": transformed_details}
-                )
-
-                etl_stats.animals_processed += 1
+            return stats
+
+        if force_refresh:
+            ids_to_process = all_ids
+        else:
+            sent_ids = set(
+                Animal.objects.filter(is_sent_to_home=True)
+                .values_list("api_id", flat=True)
+                .iterator()
+            )
+            ids_to_process = [i for i in all_ids if i not in sent_ids]
+            stats.animals_skipped = len(all_ids) - len(ids_to_process)
+            if stats.animals_skipped:
+                logger.info(f"Skipping {stats.animals_skipped} animals already sent")
+
+        stats.current_step = "Processing animals"
+
+        raw_batch = []
+
+        logger.info(f"Processing {len(ids_to_process)} animals")
+
+        workers = max(1, min(concurrency, MAX_CONCURRENCY))
+        post_futures = {}
+        with ThreadPoolExecutor(
+            max_workers=POST_WORKERS
+        ) as post_executor, ThreadPoolExecutor(max_workers=workers) as executor:
+            fetch_details = partial(
+                run_with_deadline,
+                DETAIL_DEADLINE,
+                get_animal_details,
+                use_cache=use_cache and not force_refresh,
+            )
+            completed = iter_completed(
+                executor, fetch_details, ids_to_process, workers * 2
+            )
 
-                if len(posting_batch) >= batch_size:
-                    etl_stats.current_step = (
-                        f"Posting batch {etl_stats.batches_posted + 1}"
+            for idx, (animal_id, future) in enumerate(completed, start=1):
+                try:
+                    raw_batch.append(future.result())
+                    stats.animals_processed += 1
+
+                    if len(raw_batch) >= batch_size:
+                        stats.current_step = f"Posting batch {stats.batches_posted + 1}"
+                        submit_post_batch(post_executor, post_futures, raw_batch)
+
+                        # Keep only a few batches queued behind the POST workers
+                        if len(post_futures) > POST_WORKERS * 2:
+                            wait(post_futures, return_when=FIRST_COMPLETED)
+                        collect_posted_batches(post_futures, error_logs, stats)
+
+                        # submit_post_batch keeps its own lists, so reuse this one
+                        raw_batch.clear()
+
+                    if idx % 50 == 0:
+                        logger.info(f"Processed {idx}/{len(ids_to_process)} animals")
+                        save_progress(etl_log, stats)
+
+                except ETLError as e:
+                    logger.error(f"ETL error processing animal {animal_id}: {e}")
+                    stats.add_error(f"Animal {animal_id}: {str(e)}")
+                    error_logs.append(
+                        APIErrorLog(
+                            endpoint=f"/animals/v1/animals/{animal_id}",
+                            error_type="ETLError",
+                            error_message=str(e),
+                        )
+                    )
+                except Exception as e:
+                    logger.error(f"Unexpected error processing animal {animal_id}: {e}")
+                    stats.add_error(f"Animal {animal_id}: {str(e)}")
+                    error_logs.append(
+                        APIErrorLog(
+                            endpoint=f"/animals/v1/animals/{animal_id}",
+                            error_type=type(e).__name__,
+                            error_message=str(e),
+                        )
                     )
-                    post_animals_batch(posting_batch)
-
-                    save_animals_to_db(db_batch)
-
-                    posting_batch = []
-                    db_batch = []
 
-                if idx % 50 == 0:
-                    logger.info(f"Processed {idx}/{len(all_ids)} animals")
+                flush_error_logs(error_logs)
 
-            except ETLError as e:
-                logger.error(f"ETL error processing animal {animal_id}: {e}")
-                etl_stats.add_error(f"Animal {animal_id}: {str(e)}")
-                APIErrorLog.objects.create(
-                    endpoint=f"/animals/v1/animals/{animal_id}",
-                    error_type="ETLError",
-                    error_message=str(e),
-                )
-            except Exception as e:
-                logger.error(f"Unexpected error processing animal {animal_id}: {e}")
-                etl_stats.add_error(f"Animal {animal_id}: {str(e)}")
-                APIErrorLog.objects.create(
-                    endpoint=f"/animals/v1/animals/{animal_id}",
-                    error_type=type(e).__name__,
-                    error_message=str(e),
-                )
+            if raw_batch:
+                stats.current_step = f"Posting final batch"
+                submit_post_batch(post_executor, post_futures, raw_batch)
 
-        if posting_batch:
-            etl_stats.current_step = f"Posting final batch"
-            post_animals_batch(posting_batch)
-            save_animals_to_db(db_batch)
+            collect_posted_batches(post_futures, error_logs, stats, block=True)
 
-        etl_stats.complete()
+        stats.complete()
         logger.info(
-            f"ETL process completed successfully. Processed {etl_stats.animals_processed}/{etl_stats.total_animals_found} animals in {etl_stats.get_duration():.2f} seconds"
+            f"ETL process completed successfully. Processed {stats.animals_processed}/{stats.total_animals_found} animals in {stats.get_duration():.2f} seconds"
         )
-        etl_log.status = "completed" if not etl_stats.errors else "partial"
+        etl_log.status = "completed" if not stats.errors else "partial"
 
     except Exception as e:
         logger.error(f"ETL process failed: {e}")
-        etl_stats.add_error(f"Process failed: {str(e)}")
-        etl_stats.current_step = "Failed"
+        stats.add_error(f"Process failed: {str(e)}")
+        stats.current_step = "Failed"
+        stats.end_time = timezone.now()
         etl_log.status = "failed"
 
-    etl_log.total_animals_processed = etl_stats.animals_processed
-    etl_log.total_animals_sent = etl_stats.animals_posted
-    etl_log.errors_encountered = "\n".join(etl_stats.errors[:1000])
+    flush_error_logs(error_logs, force=True)
+
+    etl_log.total_animals_processed = stats.animals_processed
+    etl_log.total_animals_sent = stats.animals_posted
+    etl_log.animals_skipped = stats.animals_skipped
+    etl_log.batches_posted = stats.batches_posted
+    etl_log.errors_encountered = "\n".join(stats.errors)
     etl_log.process_end = timezone.now()
     etl_log.save()
 
-    return etl_stats
+    return stats
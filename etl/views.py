@@ -1,13 +1,13 @@
 import io
-import json
 import logging
 import unittest
-from threading import Thread
 
-from django.core.paginator import Paginator
+import orjson
+from django.db.models import Q
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
@@ -16,10 +16,21 @@ from django.views.decorators.http import require_http_methods
 from etl import tests
 
 from .models import Animal, ETLProcessingLog
-from .utils.etl_service import etl_stats, run_etl_process
+from .tasks import run_etl_background
+from .utils.etl_service import DETAIL_WORKERS, get_job_stats
 
 logger = logging.getLogger(__name__)
 
+DASHBOARD_PAGE_SIZE = 25
+
+# Dashboard step names for ETLProcessingLog statuses
+JOB_STATUS_STEPS = {
+    "running": "Running",
+    "completed": "Completed",
+    "partial": "Completed",
+    "failed": "Failed",
+}
+
 
 @method_decorator(csrf_exempt, name="dispatch")
 class ETLRunView(View):
@@ -28,15 +39,22 @@ class ETLRunView(View):
     def post(self, request):
         try:
             print("ETLRunView received POST request")
-            data = json.loads(request.body)
+            data = orjson.loads(request.body)
             batch_size = data.get("batch_size", 100)
+            concurrency = data.get("concurrency", DETAIL_WORKERS)
+            force_refresh = bool(data.get("force_refresh", False))
 
             job = ETLProcessingLog.objects.create(
                 status="running",
             )
 
-            thread = Thread(target=self.run_etl_background, args=(job.id, batch_size))
-            thread.start()
+            try:
+                run_etl_background.delay(job.id, batch_size, concurrency, force_refresh)
+            except Exception:
+                job.status = "failed"
+                job.process_end = timezone.now()
+                job.save()
+                raise
 
             return JsonResponse(
                 {"success": True, "job_id": job.id, "message": "ETL process started"}
@@ -46,55 +64,95 @@ class ETLRunView(View):
             logger.error(f"Error starting ETL process: {e}")
             return JsonResponse({"success": False, "error": str(e)}, status=500)
 
-    def run_etl_background(self, job_id, batch_size):
-        try:
-            print("Running ETL BACKGROUND")
-            job = ETLProcessingLog.objects.get(id=job_id)
-            stats = run_etl_process(batch_size=batch_size)
-
-            job.status = "completed" if stats.current_step == "Completed" else "failed"
-            job.process_end = timezone.now()
-            job.total_animals_fetched = stats.total_animals_found
-            job.total_animals_processed = stats.animals_processed
-            job.total_animals_sent = stats.animals_posted
-            job.batches_posted = stats.batches_posted
-            job.errors_encountered = json.dumps(stats.errors) if stats.errors else ""
-            job.save()
-
-        except Exception as e:
-            logger.error(f"Background ETL process error: {e}")
-            try:
-                job = ETLProcessingLog.objects.get(id=job_id)
-                job.status = "failed"
-                job.process_end = timezone.now()
-                job.errors_encountered = json.dumps([str(e)])
-                job.save()
-            except:
-                pass
-
 
 @require_http_methods(["GET"])
 def etl_status(request):
-    """Get current ETL status"""
+    """Get the status of an ETL job, the latest one unless ?job_id= is given"""
+    job_id = request.GET.get("job_id")
+    if job_id and not job_id.isdigit():
+        return JsonResponse({"error": f"Invalid job_id: {job_id}"}, status=400)
+    if job_id:
+        job = ETLProcessingLog.objects.filter(id=int(job_id)).first()
+    else:
+        job = ETLProcessingLog.objects.first()
+
+    if job is None and job_id:
+        return JsonResponse({"error": f"ETL job {job_id} not found"}, status=404)
+    if job is None:
+        return JsonResponse(
+            {
+                "job_id": None,
+                "step": "Idle",
+                "total_found": 0,
+                "processed": 0,
+                "posted": 0,
+                "batches": 0,
+                "skipped": 0,
+                "errors": 0,
+                "duration": 0,
+            }
+        )
+
+    stats = get_job_stats(job.id)
+    if stats is not None:
+        return JsonResponse(
+            {
+                "job_id": job.id,
+                "step": stats.current_step,
+                "total_found": stats.total_animals_found,
+                "processed": stats.animals_processed,
+                "posted": stats.animals_posted,
+                "batches": stats.batches_posted,
+                "skipped": stats.animals_skipped,
+                "errors": stats.error_count,
+                "duration": stats.get_duration(),
+            }
+        )
+
+    # The job runs in another process (e.g. a Celery worker); report the
+    # progress it saved on its log row
+    end = job.process_end or timezone.now()
     return JsonResponse(
         {
-            "step": etl_stats.current_step,
-            "total_found": etl_stats.total_animals_found,
-            "processed": etl_stats.animals_processed,
-            "posted": etl_stats.animals_posted,
-            "batches": etl_stats.batches_posted,
-            "errors": len(etl_stats.errors),
-            "duration": etl_stats.get_duration(),
+            "job_id": job.id,
+            "step": JOB_STATUS_STEPS.get(job.status, job.status),
+            "total_found": job.total_animals_fetched,
+            "processed": job.total_animals_processed,
+            "posted": job.total_animals_sent,
+            "batches": job.batches_posted or 0,
+            "skipped": job.animals_skipped,
+            "errors": len(job.errors_encountered.splitlines()),
+            "duration": (end - job.process_start).total_seconds(),
         }
     )
 
 
 def etl_dashboard(request):
     print("Running ETL VIEW")
-    animal_list = Animal.objects.order_by("-processed_at")
-    paginator = Paginator(animal_list, 25)
-    page = request.GET.get("page")
-    animals = paginator.get_page(page)
+    animal_list = Animal.objects.only(
+        "api_id", "name", "species", "age", "friends", "born_at", "processed_at"
+    ).order_by("-processed_at", "-id")
+
+    # Keyset pagination: continue after the last row of the previous page
+    # instead of counting the table and skipping OFFSET rows
+    try:
+        after = parse_datetime(request.GET.get("after", ""))
+    except ValueError:
+        after = None
+    after_id = request.GET.get("after_id", "")
+    if after and after_id.isdigit():
+        animal_list = animal_list.filter(
+            Q(processed_at__lt=after) | Q(processed_at=after, id__lt=int(after_id))
+        )
+
+    animals = list(animal_list[: DASHBOARD_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(animals) > DASHBOARD_PAGE_SIZE:
+        animals = animals[:DASHBOARD_PAGE_SIZE]
+        next_cursor = {
+            "after": animals[-1].processed_at.isoformat(),
+            "after_id": animals[-1].id,
+        }
 
     latest_log = ETLProcessingLog.objects.first()
 
@@ -103,6 +161,8 @@ def etl_dashboard(request):
         "etl/etl_dashboard.html",
         {
             "animals": animals,
+            "next_cursor": next_cursor,
+            "is_first_page": after is None,
             "etl_log": latest_log,
         },
     )